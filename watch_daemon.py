@@ -0,0 +1,316 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ollama import Client
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from ollama_textgen import split_text
+
+MODEL = "Code-Summary-Llama-3.2-3B-Instruct.Q4_K_S:latest"
+OUTPUT_FILE = "output/watch_output.txt"
+DEBOUNCE_SECONDS = 2.0
+RETRY_SECONDS = 30.0
+STATUS_HOST = "127.0.0.1"
+STATUS_PORT = 8765
+CONTENT_EVENTS = {"created", "modified", "deleted", "moved", "closed"}
+
+PROMPT_TEMPLATE = """You are an expert technical writer specializing in writing documentation for software projects.
+Document must have functions, endpoints, and explain request/response if any. Be clear, concise, and informative.
+Create clean, markdown-formatted technical documentation from the source code below in English.
+
+<src>
+<<<FILE_CONTENT>>>
+</src>
+"""
+
+def is_src_file(rel_path):
+    # Same rule as getFilesContents_anySrc.py: anything below a directory named 'src'
+    parts = rel_path.split(os.sep)[:-1]
+    return "src" in parts
+
+def read_file_entry(root_path, rel_path):
+    file_path = os.path.join(root_path, rel_path)
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f"\n=== ./{rel_path} ===\n\n{f.read()}"
+    except Exception as e:
+        return f"\n=== ./{rel_path} (Failed to read: {e}) ===\n"
+
+def build_corpus_index(root_path):
+    index = {}
+    for dirpath, _, filenames in os.walk(root_path):
+        for filename in filenames:
+            rel_path = os.path.relpath(os.path.join(dirpath, filename), root_path)
+            if is_src_file(rel_path):
+                index[rel_path] = read_file_entry(root_path, rel_path)
+    return index
+
+class WatchState:
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+        self.pending = set()
+        self.full_rescan = False
+        self.last_event = 0.0
+        self.corpus = {}
+        self.chunk_cache = {}
+        self.runs = 0
+        self.last_run_at = None
+        self.last_run_latency = None
+        self.last_error = None
+
+    def push(self, rel_path):
+        with self.lock:
+            self.pending.add(rel_path)
+            self.last_event = time.time()
+        self.changed.set()
+
+    def request_rescan(self):
+        with self.lock:
+            self.full_rescan = True
+            self.last_event = time.time()
+        self.changed.set()
+
+    def take_pending(self):
+        with self.lock:
+            paths = self.pending
+            rescan = self.full_rescan
+            self.pending = set()
+            self.full_rescan = False
+            self.changed.clear()
+        return paths, rescan
+
+    def status(self):
+        with self.lock:
+            return {
+                "root": self.root_path,
+                "queue_depth": len(self.pending),
+                "indexed_files": len(self.corpus),
+                "cached_chunks": sum(len(r) for r in self.chunk_cache.values()),
+                "runs": self.runs,
+                "last_run_at": self.last_run_at,
+                "last_run_latency_sec": self.last_run_latency,
+                "last_error": self.last_error,
+            }
+
+class SrcChangeHandler(FileSystemEventHandler):
+    def __init__(self, state):
+        self.state = state
+
+    def on_any_event(self, event):
+        # Ignore opened/closed_no_write: reading a file (including our own
+        # re-reads) must not queue another run
+        if event.event_type not in CONTENT_EVENTS:
+            return
+        if event.is_directory:
+            # A directory moved out of the root only reports the directory
+            # itself, not its files, so re-index the whole tree
+            if event.event_type in ("deleted", "moved"):
+                self.state.request_rescan()
+            return
+        for path in (event.src_path, getattr(event, "dest_path", "")):
+            if not path:
+                continue
+            rel_path = os.path.relpath(path, self.state.root_path)
+            if is_src_file(rel_path):
+                self.state.push(rel_path)
+
+def make_status_handler(state):
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in ("/", "/status"):
+                self.send_error(404)
+                return
+            body = json.dumps(state.status()).encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StatusHandler
+
+def apply_changes(state, rel_paths):
+    for rel_path in rel_paths:
+        if os.path.isfile(os.path.join(state.root_path, rel_path)):
+            entry = read_file_entry(state.root_path, rel_path)
+        else:
+            entry = None
+        with state.lock:
+            if entry is None:
+                state.corpus.pop(rel_path, None)
+            else:
+                state.corpus[rel_path] = entry
+
+def generate_file_chunks(client, model, entry):
+    results = []
+    for chunk in split_text(entry, max_chars=8000):
+        full_prompt = PROMPT_TEMPLATE.replace("<<<FILE_CONTENT>>>", chunk)
+        # keep_alive=-1 keeps the model loaded in Ollama between runs
+        response = client.chat(model=model, messages=[
+            {"role": "user", "content": full_prompt}
+        ], keep_alive=-1)
+        results.append(response.message.content)
+    return results
+
+def regenerate(state, client, model, output_file):
+    with state.lock:
+        entries = [(p, state.corpus[p]) for p in sorted(state.corpus)]
+
+    if not entries:
+        print("No 'src/' directories found in the project.")
+
+    # Chunks are cached per file (path + content hash), so a save only
+    # re-sends the chunks of the file that was edited
+    all_results = []
+    fresh_cache = {}
+    failed = []
+    for rel_path, entry in entries:
+        key = (rel_path, hashlib.sha256(entry.encode("utf-8")).hexdigest())
+        results = state.chunk_cache.get(key)
+        if results is None:
+            print(f"[*] Processing ./{rel_path}...")
+            try:
+                results = generate_file_chunks(client, model, entry)
+            except Exception as e:
+                print(f"[!] Error in ./{rel_path}: {e}")
+                failed.append((rel_path, str(e)))
+                # Keep the last good output for this file, if there is one
+                stale = [k for k in state.chunk_cache if k[0] == rel_path]
+                if stale:
+                    key = stale[0]
+                    results = state.chunk_cache[key]
+                else:
+                    all_results.append(f"[Error in ./{rel_path}: {e}]")
+                    continue
+        fresh_cache[key] = results
+        all_results.extend(results)
+
+    # Only keep results for files that still exist, so the cache tracks the corpus
+    with state.lock:
+        state.chunk_cache = fresh_cache
+
+    tmp_file = output_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(f"\n## Chunk {i+1}\n{r}" for i, r in enumerate(all_results)))
+    os.replace(tmp_file, output_file)
+
+    return failed
+
+def schedule_retry(state, rel_paths, delay):
+    def retry():
+        for rel_path in rel_paths:
+            state.push(rel_path)
+
+    timer = threading.Timer(delay, retry)
+    timer.daemon = True
+    timer.start()
+
+def run_worker(state, client, model, output_file, debounce, retry_delay):
+    while True:
+        state.changed.wait()
+        # Debounce: wait until no new events arrived for `debounce` seconds
+        while True:
+            with state.lock:
+                quiet_for = time.time() - state.last_event
+            if quiet_for >= debounce:
+                break
+            time.sleep(debounce - quiet_for)
+
+        rel_paths, rescan = state.take_pending()
+        if not rel_paths and not rescan:
+            continue
+
+        start_time = time.time()
+        try:
+            if rescan:
+                print("[*] Indexing 'src/' folders...")
+                corpus = build_corpus_index(state.root_path)
+                with state.lock:
+                    state.corpus = corpus
+                print(f"[*] Indexed {len(corpus)} files, generating...")
+            else:
+                print(f"[*] {len(rel_paths)} file(s) changed, regenerating...")
+                apply_changes(state, rel_paths)
+            failed = regenerate(state, client, model, output_file)
+            if failed:
+                error = "; ".join(f"./{p}: {e}" for p, e in failed)
+                print(f"[!] {len(failed)} file(s) failed, retrying in {retry_delay:.0f} sec")
+                schedule_retry(state, [p for p, _ in failed], retry_delay)
+            else:
+                error = None
+        except Exception as e:
+            print(f"[!] Regeneration failed: {e}")
+            error = str(e)
+
+        elapsed = time.time() - start_time
+        with state.lock:
+            state.runs += 1
+            state.last_run_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            state.last_run_latency = round(elapsed, 3)
+            state.last_error = error
+        print(f"[*] Output updated in {elapsed:.1f} sec -> {output_file}")
+
+def main(root_path):
+    root_path = os.path.abspath(root_path)
+    if not os.path.isdir(root_path):
+        print(f"No such folder: {root_path}")
+        sys.exit(1)
+
+    state = WatchState(root_path)
+    client = Client()
+    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+
+    # Bind the status port and start watching before any slow work, so a busy
+    # port fails fast and saves made during the first run are still queued
+    server = ThreadingHTTPServer((STATUS_HOST, STATUS_PORT), make_status_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[*] Status endpoint: http://{STATUS_HOST}:{STATUS_PORT}/status")
+
+    observer = Observer()
+    observer.schedule(SrcChangeHandler(state), root_path, recursive=True)
+    observer.start()
+    print(f"[*] Watching {root_path} (Ctrl+C to stop)")
+
+    print(f"[*] Loading model {MODEL}...")
+    try:
+        client.generate(model=MODEL, prompt="", keep_alive=-1)
+    except Exception as e:
+        print(f"[!] Failed to preload model: {e}")
+
+    # The initial index and generation go through the worker like any other run
+    state.request_rescan()
+    threading.Thread(
+        target=run_worker,
+        args=(state, client, MODEL, OUTPUT_FILE, DEBOUNCE_SECONDS, RETRY_SECONDS),
+        daemon=True,
+    ).start()
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("[*] Stopping...")
+    finally:
+        observer.stop()
+        observer.join()
+        server.shutdown()
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python watch_daemon.py <local folder>")
+        sys.exit(1)
+
+    input_path = sys.argv[1]
+    main(input_path)